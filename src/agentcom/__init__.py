@@ -1,27 +1,46 @@
 # Import dai moduli interni per esporre direttamente i decorator e endpoint
 from .decorators.capability_decorator import capability
 from .decorators.logger import log_request
-from .endpoints.capabality_endpoint import register_capability_endpoint
+from .endpoints.capabality_endpoint import register_capability_endpoint, reset_capability_cache
 from .endpoints.session_endpoint import register_session_endpoint
-from .registry import REGISTERED_ENDPOINTS
-from .config import set_agent_config, get_agent_config, reset_agent_config
-from .models import (
-    SessionRequest,
-    SessionResponse,
-    AcceptedCapability,
-    RejectedCapability,
+from .registry import (
+    REGISTERED_ENDPOINTS,
+    CapabilityEntry,
+    get_registered_endpoints,
+    freeze_registry,
 )
+from .config import set_agent_config, get_agent_config, reset_agent_config
+from .clients.capability_client import get_capability, close_session
+from .models import SessionRequest
+
+
+# I modelli di risposta vengono importati solo al primo accesso
+_LAZY_MODELS = frozenset({"SessionResponse", "AcceptedCapability", "RejectedCapability"})
+
+
+def __getattr__(name):
+    if name in _LAZY_MODELS:
+        from . import models
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Puoi anche aggiungere altri decorator qui in futuro
 __all__ = [
     "capability",
     "register_capability_endpoint",
+    "reset_capability_cache",
     "register_session_endpoint",
     "log_request",
     "REGISTERED_ENDPOINTS",
+    "CapabilityEntry",
+    "get_registered_endpoints",
+    "freeze_registry",
     "set_agent_config",
     "get_agent_config",
     "reset_agent_config",
+    "get_capability",
+    "close_session",
     "SessionRequest",
     "SessionResponse",
     "AcceptedCapability",
@@ -1,24 +1,141 @@
+from typing import Any, Optional, Tuple
+import asyncio
+import logging
+import time
+
 import aiohttp
-from aiomisc.circuit_breaker import CircuitBreaker
+from aiomisc.circuit_breaker import CircuitBreaker, CircuitBroken
+
+from agentcom.serialization import json_dumps, json_loads
+
+
+logger = logging.getLogger(__name__)
+
+CAPABILITY_URL = "http://localhost:8080/capability"
+
+# How long (seconds) the last good body may be served while the circuit is open
+FALLBACK_TTL = 30
+
 
+def _is_upstream_failure(exc: Exception) -> bool:
+    """Only timeouts, connection errors and 5xx responses should trip the breaker."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500
+    return True
 
-# Istanza del circuit breaker
+
+# Istanza del circuit breaker: conta solo errori di rete/upstream, non bug
+# locali (es. errori di parsing).
 cb = CircuitBreaker(
     error_ratio=0.5,
     response_time=5,
+    exceptions=(aiohttp.ClientError, asyncio.TimeoutError),
+    exception_inspector=_is_upstream_failure,
 )
 
+# Sessione condivisa: evita handshake TCP/TLS, lookup DNS e un nuovo
+# connection pool a ogni chiamata. È legata all'event loop che l'ha creata,
+# quindi viene ricreata se la chiamata arriva da un altro loop.
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Last successful result and the monotonic time it was fetched at
+_last_result: Optional[Tuple[float, Any]] = None
+
+
+def _json_serialize(obj: Any) -> str:
+    # aiohttp expects a str from json_serialize
+    return json_dumps(obj).decode("utf-8")
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared client session, creating it lazily on first use.
+
+    A session can only be used from the event loop it was created on (e.g.
+    each `asyncio.run()` has its own), so a new one is created when the
+    running loop changes. The old one is dropped: its loop is usually closed
+    already, so it cannot be closed from here.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session_loop = loop
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=5),
+            raise_for_status=True,
+            json_serialize=_json_serialize,
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """
+    Close the shared client session.
+
+    Call this on application shutdown, e.g. from a FastAPI lifespan handler:
+    ```python
+    from contextlib import asynccontextmanager
+    from agentcom import close_session
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await close_session()
+
+    app = FastAPI(lifespan=lifespan)
+    ```
+    """
+    global _session, _session_loop
+    if (
+        _session is not None
+        and not _session.closed
+        and _session_loop is asyncio.get_running_loop()
+    ):
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+async def _fetch(session: aiohttp.ClientSession) -> Tuple[bytes, str, Optional[str]]:
+    async with session.get(CAPABILITY_URL) as response:
+        body = await response.read()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "capability status=%s content-type=%s bytes=%d",
+                response.status,
+                response.headers.get("content-type"),
+                len(body),
+            )
+        return body, response.content_type, response.charset
+
 
 async def get_capability():
-    # Il circuit breaker va chiamato come funzione wrapper
-    async def _wrapped_call():
-        async with aiohttp.ClientSession() as session:
-            async with session.get("http://localhost:8080/capability") as response:
-                print("Status:", response.status)
-                print("Content-Type:", response.headers.get("content-type"))
-
-                body = await response.text()
-                print("Body:", body)
-                return body
-
-    return await cb.call(_wrapped_call)
\ No newline at end of file
+    """
+    Fetch the capability document of the remote agent.
+
+    JSON responses are returned parsed (with orjson when installed), other
+    content types as decoded text.
+
+    While the circuit breaker is open, the last successful result is returned
+    if it is younger than `FALLBACK_TTL` seconds; otherwise `CircuitBroken`
+    is raised immediately.
+    """
+    global _last_result
+    session = await _get_session()
+
+    # Only the network round-trip runs inside the circuit breaker
+    try:
+        body, content_type, charset = await cb.call_async(_fetch, session)
+    except CircuitBroken:
+        if _last_result is not None and time.monotonic() - _last_result[0] < FALLBACK_TTL:
+            return _last_result[1]
+        raise
+
+    if content_type == "application/json":
+        result = json_loads(body)
+    else:
+        result = body.decode(charset or "utf-8")
+    _last_result = (time.monotonic(), result)
+    return result
@@ -4,11 +4,11 @@ Agent configuration management.
 This module provides a centralized configuration context for agent metadata
 that must be set by the application using the agentcom library.
 """
-from typing import Optional, List
-from dataclasses import dataclass, field
+from typing import Optional, Sequence, Tuple
+from dataclasses import dataclass, replace
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
     """
     Configuration for the agent.
@@ -16,6 +16,10 @@ class AgentConfig:
     This class holds agent-level metadata that must be set by the application
     using the agentcom library. These values serve as defaults for endpoints
     and can be overridden per-endpoint if needed.
+
+    Instances are immutable (`supported_transports` is a tuple):
+    `set_agent_config()` swaps in a new instance, so readers always see a
+    consistent snapshot without locking.
     
     Example:
     --------
@@ -36,7 +40,7 @@ class AgentConfig:
     """
     agent_id: str = "agent://unknown"
     version: str = "0.0.0"
-    supported_transports: List[str] = field(default_factory=lambda: ["http-json"])
+    supported_transports: Tuple[str, ...] = ("http-json",)
 
 
 # Global instance
@@ -46,7 +50,7 @@ _agent_config = AgentConfig()
 def set_agent_config(
     agent_id: Optional[str] = None,
     version: Optional[str] = None,
-    supported_transports: Optional[List[str]] = None,
+    supported_transports: Optional[Sequence[str]] = None,
 ) -> None:
     """
     Set the global agent configuration.
@@ -59,8 +63,9 @@ def set_agent_config(
         Unique identifier for the agent (e.g., "agent://inventory/worker-1").
     version : Optional[str]
         Agent version (e.g., "1.2.0").
-    supported_transports : Optional[List[str]]
-        List of supported transport protocols (e.g., ["http-json", "grpc"]).
+    supported_transports : Optional[Sequence[str]]
+        Supported transport protocols (e.g., ["http-json", "grpc"]), stored
+        as a tuple.
     
     Example:
     --------
@@ -75,12 +80,15 @@ def set_agent_config(
     ```
     """
     global _agent_config
+    changes = {}
     if agent_id is not None:
-        _agent_config.agent_id = agent_id
+        changes["agent_id"] = agent_id
     if version is not None:
-        _agent_config.version = version
+        changes["version"] = version
     if supported_transports is not None:
-        _agent_config.supported_transports = supported_transports
+        changes["supported_transports"] = tuple(supported_transports)
+    # Build a new instance and rebind it in one step (atomic for readers)
+    _agent_config = replace(_agent_config, **changes)
 
 
 def get_agent_config() -> AgentConfig:
@@ -1,9 +1,18 @@
-from functools import wraps, partial
+from functools import wraps
 from typing import List, Dict, Any, Optional
 import inspect
-import asyncio
+import typing
 
-from agentcom.registry import REGISTERED_ENDPOINTS
+from agentcom.registry import CapabilityEntry, register_endpoint
+
+
+def _format_annotation(annotation: Any) -> str:
+    """Render a resolved type hint as a short, readable string."""
+    if isinstance(annotation, str):
+        return annotation
+    if isinstance(annotation, type) and not typing.get_args(annotation):
+        return annotation.__name__
+    return repr(annotation)
 
 
 def capability(
@@ -13,6 +22,8 @@ def capability(
     auth_required: Optional[List[str]] = None,
     cost: Optional[Dict[str, Any]] = None,
     rate_limit: Optional[str] = None,
+    version: str = "1.0.0",
+    threaded: bool = True,
 ):
     """
     Decorator che registra l'endpoint come capability con introspezione dei parametri.
@@ -20,56 +31,81 @@ def capability(
     Parametri opzionali per arricchire la capability:
     - `name`: nome logico della capability (es. `create_ticket`).
     - `auth_required`: lista di scope o permessi richiesti.
-    - `cost`: dict con stima dei costi (es. `{"units": "tokens", "estimate": 5}`).
+    - `cost`: dict con stima dei costi (es. `{"units": "tokens", "estimate": 5}`),
+      validato una sola volta qui come `CostSpec` (solleva `ValidationError`
+      se non valido).
     - `rate_limit`: stringa con limite (es. `"10/s"`).
+    - `version`: versione della capability (default `"1.0.0"`), usata nella
+      negoziazione delle sessioni.
+    - `threaded`: se `False`, un handler sincrono viene eseguito direttamente
+      nell'event loop invece che nel threadpool di FastAPI. Evita due cambi
+      di thread per richiesta, ma va usato solo per handler molto economici
+      (es. costruzione di un dict, <100µs) che non fanno mai I/O bloccante:
+      altrimenti bloccano tutte le altre richieste.
+
+    Con `threaded=True` (default) la funzione decorata viene restituita
+    invariata: gli handler sincroni vengono eseguiti nel threadpool di
+    FastAPI. Fuori da FastAPI, da codice async, usare
+    `await starlette.concurrency.run_in_threadpool(func, ...)`.
     """
 
     def decorator(func):
+        cost_spec = None
+        if cost:
+            # Import locale: i modelli di risposta vengono caricati (e
+            # `CostSpec` compilato) solo per le capability con un costo
+            from agentcom.models.session_response import CostSpec
+
+            cost_spec = CostSpec.model_validate(cost)
         sig = inspect.signature(func)
         parameters: List[Dict[str, Any]] = []
-        for param_name, param in sig.parameters.items():
-            # Ignora self e request
-            if param_name in ("self", "request"):
-                continue
-            parameters.append({
-                "name": param_name,
-                "default": None if param.default is inspect.Parameter.empty else param.default,
-                "annotation": (
-                    str(param.annotation)
-                    if param.annotation is not inspect.Parameter.empty
-                    else "Any"
-                ),
-            })
+        if sig.parameters:
+            # Resolve all hints in one pass (also handles string annotations)
+            try:
+                hints = typing.get_type_hints(func)
+            except (NameError, TypeError):
+                hints = getattr(func, "__annotations__", {})
 
-        default_name = None
-        if not name and path:
-            default_name = path.strip("/").replace("/", "_") or path
+            for param_name, param in sig.parameters.items():
+                # Ignora self e request
+                if param_name in ("self", "request"):
+                    continue
+                parameters.append({
+                    "name": param_name,
+                    "default": None if param.default is inspect.Parameter.empty else param.default,
+                    "annotation": (
+                        _format_annotation(hints[param_name])
+                        if param_name in hints
+                        else "Any"
+                    ),
+                })
 
-        REGISTERED_ENDPOINTS.append({
-            "path": path,
-            "method": method,
-            "name": name or default_name,
-            "description": func.__doc__ or "",
-            "parameters": parameters,
-            "auth_required": auth_required or [],
-            "cost": cost or {},
-            "rate_limit": rate_limit,
-        })
+        entry = CapabilityEntry(
+            path=path,
+            method=method,
+            name=name,
+            description=func.__doc__ or "",
+            parameters=parameters,
+            auth_required=auth_required or [],
+            cost=cost or {},
+            rate_limit=rate_limit,
+            version=version,
+            handler=func,
+            cost_spec=cost_spec,
+        )
+        register_endpoint(entry)
 
-        # Support both async and sync functions. If the original function is
-        # synchronous, run it in the default thread executor to avoid
-        # blocking the event loop.
-        if inspect.iscoroutinefunction(func):
+        if not threaded and not inspect.iscoroutinefunction(func):
+            # Cheap sync handler: run it inline in the event loop
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                return await func(*args, **kwargs)
-        else:
-            @wraps(func)
-            async def wrapper(*args, **kwargs):
-                loop = asyncio.get_running_loop()
-                func_call = partial(func, *args, **kwargs)
-                return await loop.run_in_executor(None, func_call)
-        return wrapper
+                return func(*args, **kwargs)
+            return wrapper
+
+        # The function is returned unchanged: FastAPI already runs sync
+        # handlers in its own threadpool, so offloading them here as well
+        # would only add extra thread switches per request.
+        return func
 
     return decorator
 
@@ -1,10 +1,11 @@
 """
 Endpoints for agentcom library.
 """
-from .capabality_endpoint import register_capability_endpoint
+from .capabality_endpoint import register_capability_endpoint, reset_capability_cache
 from .session_endpoint import register_session_endpoint
 
 __all__ = [
     "register_capability_endpoint",
+    "reset_capability_cache",
     "register_session_endpoint",
 ]
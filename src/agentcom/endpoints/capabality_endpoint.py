@@ -4,15 +4,23 @@ Capability endpoint that exposes agent metadata and capabilities.
 This module provides the /capability endpoint which returns agent information
 including registered capabilities with their action schemas from OpenAPI.
 """
-from fastapi import FastAPI
-from typing import List, Dict, Any
+from fastapi import FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from typing import List, Dict, Any, Optional
 
-from agentcom.registry import REGISTERED_ENDPOINTS
+from agentcom.registry import (
+    get_frozen_endpoints,
+    get_registry_version,
+    bump_registry_version,
+    freeze_registry,
+)
 from agentcom.config import get_agent_config
+from agentcom.serialization import json_dumps
 
 
 def register_capability_endpoint(
     app: FastAPI,
+    cache_max_age: int = 60,
 ):
     """
     Automatically mount the `/capability` endpoint on the FastAPI app and return
@@ -31,6 +39,9 @@ def register_capability_endpoint(
     supported_transports : Optional[List[str]]
         List of supported transport protocols. If not provided, uses the configured value
         from `config.set_agent_config()` or defaults to ["http-json"].
+    cache_max_age : int
+        `max-age` (seconds) advertised in the `Cache-Control` header so that
+        intermediary caches can serve the response. Defaults to 60.
 
     Usage:
     ------
@@ -76,48 +87,91 @@ def register_capability_endpoint(
                 "auth_required": ["scope:ticket:create"],
                 "cost": {"units": "tokens", "estimate": 5},
                 "rate_limit": "10/s",
+                "version": "1.0.0",
                 "action_schema": {...}  // OpenAPI operation object
             }
         ]
     }
     ```
     """
-    # Use provided values or fall back to configured/default values
-    config = get_agent_config()
+    # Capabilities only change when the registry does, so the payload is
+    # rebuilt and serialized once per registry version (and agent config)
+    # instead of on every request.
+    cache: Dict[str, Any] = {
+        "version": -1,
+        "capabilities": None,
+        "raw_bytes": None,
+        "config": None,
+        "bytes": None,
+    }
+    cache_headers = {"Cache-Control": f"public, max-age={cache_max_age}"}
+    app.router.on_startup.append(freeze_registry)
+
+    def _build_cache(version: int) -> None:
+        # Read the memoized schema directly; regenerate it at most once per
+        # registry version if something reset it.
+        openapi_schema = app.openapi_schema or app.openapi()
+        paths = openapi_schema.get("paths", {})
+
+        capabilities_out: List[Dict[str, Any]] = [
+            {
+                **cap.to_public_dict(),
+                "action_schema": paths.get(cap.path, {}).get(cap.method_lower),
+            }
+            for cap in get_frozen_endpoints()
+        ]
+
+        # Parameter defaults and `cost` may hold values that JSON encoders
+        # do not handle (Decimal, Enum, UUID, ...): encode them here, once
+        # per registry version, as FastAPI would do per request.
+        cache["capabilities"] = jsonable_encoder(capabilities_out)
+        cache["raw_bytes"] = json_dumps(jsonable_encoder(openapi_schema))
+        cache["config"] = None  # force re-serialization of the payload
+        cache["version"] = version
 
     @app.get("/capability")
     async def capability_endpoint(raw: bool = False):
-        openapi_schema = app.openapi()
+        version = get_registry_version()
+        if cache["version"] != version:
+            _build_cache(version)
         if raw:
-            return openapi_schema
-
-        paths = openapi_schema.get("paths", {})
+            return Response(
+                content=cache["raw_bytes"],
+                media_type="application/json",
+                headers=cache_headers,
+            )
 
-        capabilities_out: List[Dict[str, Any]] = []
-        for cap in REGISTERED_ENDPOINTS:
-            path = cap.get("path")
-            method = (cap.get("method") or "GET").lower()
-
-            action_schema = None
-            if path and path in paths:
-                path_item = paths.get(path, {})
-                action_schema = path_item.get(method)
-
-            capabilities_out.append({
-                "name": cap.get("name") or path,
-                "path": path,
-                "method": cap.get("method"),
-                "description": cap.get("description"),
-                "parameters": cap.get("parameters"),
-                "auth_required": cap.get("auth_required", []),
-                "cost": cap.get("cost", {}),
-                "rate_limit": cap.get("rate_limit"),
-                "action_schema": action_schema,
+        # AgentConfig is immutable, so identity tells us whether it changed
+        config = get_agent_config()
+        if cache["config"] is not config:
+            cache["bytes"] = json_dumps({
+                "agent_id": config.agent_id,
+                "version": config.version,
+                "capabilities": cache["capabilities"],
+                "supported_transports": config.supported_transports,
             })
+            cache["config"] = config
+
+        return Response(
+            content=cache["bytes"],
+            media_type="application/json",
+            headers=cache_headers,
+        )
+
+
+def reset_capability_cache(app: Optional[FastAPI] = None) -> None:
+    """
+    Invalidate the cached `/capability` payload.
 
-        return {
-            "agent_id": config.agent_id,
-            "version": config.version,
-            "capabilities": capabilities_out,
-            "supported_transports": config.supported_transports,
-        }
+    The payload is rebuilt automatically when capabilities are registered.
+    Call this after changing routes dynamically, or in tests.
+
+    Parameters:
+    -----------
+    app : Optional[FastAPI]
+        If provided, its memoized OpenAPI schema is dropped as well so that
+        the next `/capability` request picks up route changes.
+    """
+    if app is not None:
+        app.openapi_schema = None
+    bump_registry_version()
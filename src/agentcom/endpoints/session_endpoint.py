@@ -1,23 +1,52 @@
 """
 Session negotiation and management endpoints for agent coordination.
 """
-from fastapi import FastAPI, HTTPException
-from typing import List, Dict, Any, Optional
-import json
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from packaging.specifiers import SpecifierSet
+from pydantic import ValidationError
+from typing import List, Dict, Any, Callable, Optional, Sequence
 import base64
-from datetime import datetime, timedelta
+import time
 
 from agentcom.models.session import (
+    TRANSPORT_BITS,
+    transport_mask,
+    SessionMeta,
+    SessionPolicy,
     SessionRequest,
-    SessionResponse,
-    AcceptedCapability,
-    RejectedCapability,
-    NegotiatedSession,
-    PolicyAck,
-    ResponseSessionMeta
+    warm_session_models,
 )
-from agentcom.registry import REGISTERED_ENDPOINTS
+from agentcom.registry import CapabilityEntry, freeze_registry, lookup, lookup_exact
 from agentcom.config import get_agent_config
+from agentcom.serialization import json_dumps
+
+# Constant, pre-encoded JWT header ({"alg":"HS256","typ":"JWT"})
+_JWT_HEADER = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9."
+
+# Transports this endpoint can negotiate, also as a `TRANSPORT_BITS` mask
+_SUPPORTED_TRANSPORTS = frozenset({"http-json", "grpc", "nats"})
+_SERVER_MASK = transport_mask(_SUPPORTED_TRANSPORTS)
+_TRANSPORT_BY_BIT = {bit: name for name, bit in TRANSPORT_BITS.items()}
+_DEFAULT_TRANSPORT = "http-json"
+
+# The handler reads the raw body, so FastAPI cannot document it by itself.
+# The schema is inlined and its nested models are referenced through a JSON
+# pointer to their `$defs`, inside this very request body.
+_REQUEST_BODY_REF_TEMPLATE = (
+    "#/paths/~1session/post/requestBody/content/application~1json/schema/$defs/{model}"
+)
+
+
+def _request_body_openapi() -> Dict[str, Any]:
+    """OpenAPI `requestBody` of the /session operation."""
+    schema = SessionRequest.model_json_schema(ref_template=_REQUEST_BODY_REF_TEMPLATE)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
 
 
 def _generate_session_token(session_id: str, timeout_seconds: int = 180) -> str:
@@ -25,65 +54,104 @@ def _generate_session_token(session_id: str, timeout_seconds: int = 180) -> str:
     Generate a mock JWT-like session token.
     In production, you'd use PyJWT or similar.
     """
+    now = int(time.time())
     payload = {
         "session_id": session_id,
-        "iat": datetime.utcnow().isoformat(),
-        "exp": (datetime.utcnow() + timedelta(seconds=timeout_seconds)).isoformat(),
+        "iat": now,
+        "exp": now + timeout_seconds,
     }
     # Mock encoding (not secure, for demo purposes)
-    encoded = base64.b64encode(json.dumps(payload).encode()).decode()
-    return f"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.{encoded}.mock_signature"
+    encoded = base64.urlsafe_b64encode(json_dumps(payload)).rstrip(b"=")
+    return (_JWT_HEADER + encoded + b".mock_signature").decode("ascii")
 
 
-def _match_version(required: Optional[str], available: str) -> bool:
+def _select_version(
+    required: SpecifierSet, candidates: Sequence[CapabilityEntry]
+) -> Optional[CapabilityEntry]:
     """
-    Simple version matching logic.
-    Supports: ">=1.0,<2.0", "1.2.x", exact versions, etc.
-    For production, use packaging.version.
+    Return the first registered candidate whose version, parsed at
+    registration time (see `CapabilityEntry.parsed_version`), satisfies a
+    parsed constraint (see `WantedCapability.specifier`).
+
+    Pre-releases follow PEP 440: they only match if the constraint names a
+    pre-release, or if no final release matches. `SpecifierSet.filter()`
+    applies this rule over the whole candidate set.
     """
-    if not required:
-        return True
-    # Simplified: just check if available version starts with base version
-    # In production, use proper semver parsing
-    return True  # Mock: accept all for demo
+    allowed = set(required.filter(
+        cap.parsed_version for cap in candidates if cap.parsed_version is not None
+    ))
+    return next((cap for cap in candidates if cap.parsed_version in allowed), None)
 
 
-def _find_capability(name: str, registry: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """Find a capability in the registry by name."""
-    for cap in registry:
-        if cap.get("name") == name or str(cap.get("path")).strip("/").replace("/", "_") == name:
-            return cap
-    return None
+def _select_transport(preferences: Sequence[str], mask: int) -> str:
+    """
+    Select the first transport in the client's preference order that this
+    endpoint supports, given `mask`, the `TRANSPORT_BITS` mask of `preferences`.
+    """
+    common = mask & _SERVER_MASK
+    if not common:
+        return _DEFAULT_TRANSPORT
+    if not common & (common - 1):
+        # A single transport in common: no need to look at the order
+        return _TRANSPORT_BY_BIT[common]
+    for transport in preferences:
+        if TRANSPORT_BITS.get(transport, 0) & common:
+            return transport
+    return _DEFAULT_TRANSPORT
+
+
+# Response-side builders used per wanted capability. The response models are
+# imported when the endpoint is registered, not with this module, so
+# `_bind_response_builders()` binds these once at that point.
+build_accepted_capability: Optional[Callable[..., Any]] = None
+build_rejected_capability: Optional[Callable[..., Any]] = None
+
+
+def _bind_response_builders() -> None:
+    """Import the response models and bind the builders used by `_negotiate_capability`."""
+    global build_accepted_capability, build_rejected_capability
+    from agentcom.models.session_response import (
+        build_accepted_capability,
+        build_rejected_capability,
+    )
 
 
-def _negotiate_capability(wanted: Any, registered: Optional[Dict[str, Any]]) -> tuple:
+def _negotiate_capability(wanted: Any, candidates: Sequence[CapabilityEntry]) -> tuple:
     """
-    Negotiate a single capability.
+    Negotiate a single capability against its registered versions.
     Returns (AcceptedCapability | None, RejectedCapability | None)
     """
-    if not registered:
-        rejected = RejectedCapability(
+    if not candidates:
+        rejected = build_rejected_capability(
             name=wanted.name,
             reason="capability_not_found",
             details=f"Capability '{wanted.name}' is not available on this agent"
         )
         return None, rejected
 
-    # Check version compatibility
-    if wanted.version and not _match_version(wanted.version, registered.get("version", "1.0.0")):
-        rejected = RejectedCapability(
-            name=wanted.name,
-            reason="unsupported_version",
-            supported_versions=["1.0.0", "1.1.0"],  # Mock supported versions
-            details=f"Requested {wanted.version}, available 1.0.0-1.1.0"
-        )
-        return None, rejected
+    # Check version compatibility: pick the first registered version that matches
+    registered = candidates[0]
+    specifier = wanted.specifier
+    if specifier is not None:
+        # Fast path: a bare version equal to a registered one ("1.4.2")
+        registered = lookup_exact(wanted.name, wanted.version)
+        if registered is None or registered.parsed_version is None:
+            registered = _select_version(specifier, candidates)
+        if registered is None:
+            supported_versions = [cap.version for cap in candidates]
+            rejected = build_rejected_capability(
+                name=wanted.name,
+                reason="unsupported_version",
+                supported_versions=supported_versions,
+                details=f"Requested {wanted.version}, available {', '.join(supported_versions)}"
+            )
+            return None, rejected
 
     # Check constraints (latency, cost, etc.)
-    constraints = wanted.constraints or {}
-    max_latency = constraints.get("max_latency_ms")
+    constraints = wanted.constraints
+    max_latency = constraints.max_latency_ms if constraints is not None else None
     if max_latency and max_latency < 500:  # Mock: assume p99 is ~850ms
-        rejected = RejectedCapability(
+        rejected = build_rejected_capability(
             name=wanted.name,
             reason="latency_constraint_violation",
             details=f"Required latency {max_latency}ms, but expected p99 is ~850ms"
@@ -91,11 +159,11 @@ def _negotiate_capability(wanted: Any, registered: Optional[Dict[str, Any]]) ->
         return None, rejected
 
     # Capability accepted: build response
-    accepted = AcceptedCapability(
+    accepted = build_accepted_capability(
         name=wanted.name,
-        version=registered.get("version", "1.0.0"),
-        action_schema=registered.get("path"),  # or could be a URL
-        estimated_cost=registered.get("cost"),
+        version=registered.version,
+        action_schema=registered.path,  # or could be a URL
+        estimated_cost=registered.cost_spec,  # validated at registration
         latency_p99_ms=850,  # Mock P99 latency
     )
     return accepted, None
@@ -132,11 +200,29 @@ def register_session_endpoint(app: FastAPI):
     The endpoint validates that the configured agent_id is listed in the
     request's participants list.
     """
-    # Use provided agent_id or fall back to configured/default value
-    config = get_agent_config()
+    # Response models are only needed once the endpoint is mounted
+    _bind_response_builders()
+    from agentcom.models.session_response import (
+        SessionResponse,
+        AcceptedCapability,
+        RejectedCapability,
+        build_negotiated_session,
+        build_policy_ack,
+        build_response_meta,
+        build_session_response,
+        dump_response_json,
+    )
+
+    # Registration is done by the time the app starts
+    app.router.on_startup.append(freeze_registry)
+    app.router.on_startup.append(warm_session_models)
 
-    @app.post("/session", response_model=SessionResponse)
-    async def session_endpoint(request: SessionRequest) -> SessionResponse:
+    @app.post(
+        "/session",
+        response_model=SessionResponse,
+        openapi_extra=_request_body_openapi(),
+    )
+    async def session_endpoint(http_request: Request) -> Response:
         """
         Establish a session between agents with capability negotiation.
 
@@ -159,8 +245,24 @@ def register_session_endpoint(app: FastAPI):
         - policy_ack: acknowledgment of accepted policies
         """
 
+        # Validate the raw bytes directly in pydantic-core instead of letting
+        # FastAPI json.loads() them into dicts and validate those.
+        try:
+            request = SessionRequest.model_validate_json(await http_request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)]
+            )
+
+        config = get_agent_config()
+        wanted_capabilities = request.wanted_capabilities
+        # `policy` and `meta` may be explicitly null
+        policy = request.policy or SessionPolicy.model_construct()
+        prefs = request.session_preferences
+        meta = request.meta or SessionMeta.model_construct()
+
         # Validate that this agent is a participant (optional)
-        if config.agent_id not in request.participants:
+        if config.agent_id not in request.participant_set:
             raise HTTPException(
                 status_code=400,
                 detail=f"Agent {config.agent_id} is not listed as a participant"
@@ -170,9 +272,8 @@ def register_session_endpoint(app: FastAPI):
         rejected_caps: List[RejectedCapability] = []
 
         # Negotiate each wanted capability
-        for wanted_cap in request.wanted_capabilities:
-            registered_cap = _find_capability(wanted_cap.name, REGISTERED_ENDPOINTS)
-            accepted, rejected = _negotiate_capability(wanted_cap, registered_cap)
+        for wanted_cap in wanted_capabilities:
+            accepted, rejected = _negotiate_capability(wanted_cap, lookup(wanted_cap.name))
 
             if accepted:
                 accepted_caps.append(accepted)
@@ -180,7 +281,7 @@ def register_session_endpoint(app: FastAPI):
                 rejected_caps.append(rejected)
 
         # Determine session status
-        if len(accepted_caps) == len(request.wanted_capabilities) and not rejected_caps:
+        if len(accepted_caps) == len(wanted_capabilities) and not rejected_caps:
             status = "accepted"
         elif accepted_caps:
             status = "partial"
@@ -188,38 +289,34 @@ def register_session_endpoint(app: FastAPI):
             status = "rejected"
 
         # Select transport (first available in preferences that we support)
-        selected_transport = "http-json"  # default
-        supported_transports = ["http-json", "grpc", "nats"]
-        for pref_transport in (request.session_preferences.transport or ["http-json"]):
-            if pref_transport in supported_transports:
-                selected_transport = pref_transport
-                break
+        selected_transport = _select_transport(prefs.transport, prefs.transport_mask)
 
         # Negotiate timeout (use minimum of requested and max allowed)
         negotiated_timeout = min(request.timeout_seconds or 180, 180)
 
-        # Build response
-        negotiated = NegotiatedSession(
+        # Build response. Every value below is already validated or produced
+        # here, so the trusted builders skip re-validation.
+        negotiated = build_negotiated_session(
             timeout_seconds=negotiated_timeout,
             transport=selected_transport,
-            retry_strategy=request.session_preferences.retry_strategy or "exponential",
-            max_retries=request.session_preferences.max_retries or 3,
+            retry_strategy=prefs.retry_strategy or "exponential",
+            max_retries=prefs.max_retries or 3,
         )
 
-        policy_ack = PolicyAck(
-            require_evidence=request.policy.require_evidence if request.policy else False,
-            conflict_resolution=request.policy.conflict_resolution if request.policy else "planner_wins",
+        policy_ack = build_policy_ack(
+            require_evidence=policy.require_evidence,
+            conflict_resolution=policy.conflict_resolution,
         )
 
         session_token = _generate_session_token(request.session_id, negotiated_timeout)
 
-        response_meta = ResponseSessionMeta(
-            trace_id=request.meta.trace_id if request.meta else None,
-            correlation_id=request.meta.correlation_id if request.meta else None,
+        response_meta = build_response_meta(
+            trace_id=meta.trace_id,
+            correlation_id=meta.correlation_id,
             responder_version="agent-proto-1.0.4",
         )
 
-        return SessionResponse(
+        response = build_session_response(
             session_id=request.session_id,
             status=status,
             accepted_capabilities=accepted_caps,
@@ -230,3 +327,7 @@ def register_session_endpoint(app: FastAPI):
             meta=response_meta,
             error=None if status != "rejected" else "No compatible capabilities found",
         )
+        # Serialize directly to JSON bytes in pydantic-core: skips FastAPI's
+        # response-model re-validation and jsonable_encoder pass, and the
+        # intermediate dict (response_model is kept for the OpenAPI docs).
+        return Response(content=dump_response_json(response), media_type="application/json")
@@ -1,19 +1,36 @@
 """
 Pydantic models for agentcom library.
+
+Response-side names (see `session_response`) are imported on first access.
 """
+from typing import Any
+
 from .session import (
     SessionRequest,
-    SessionResponse,
-    AcceptedCapability,
-    RejectedCapability,
-    NegotiatedSession,
-    PolicyAck,
     SessionMeta,
     WantedCapability,
+    ConstraintSpec,
     SessionPreferences,
     SessionPolicy,
+    TRANSPORT_BITS,
+    transport_mask,
+    get_type_adapter,
+    SESSION_REQUEST_ADAPTER,
+    WANTED_CAPS_ADAPTER,
+    dump_request,
+    dump_request_json,
+    warm_session_models,
+    RESPONSE_NAMES,
 )
 
+
+def __getattr__(name: str) -> Any:
+    if name in RESPONSE_NAMES:
+        from . import session_response
+        return getattr(session_response, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "SessionRequest",
     "SessionResponse",
@@ -23,6 +40,25 @@ __all__ = [
     "PolicyAck",
     "SessionMeta",
     "WantedCapability",
+    "ConstraintSpec",
+    "CostSpec",
     "SessionPreferences",
     "SessionPolicy",
+    "ResponseSessionMeta",
+    "build_accepted_capability",
+    "build_rejected_capability",
+    "build_negotiated_session",
+    "build_policy_ack",
+    "build_response_meta",
+    "build_session_response",
+    "TRANSPORT_BITS",
+    "transport_mask",
+    "get_type_adapter",
+    "SESSION_REQUEST_ADAPTER",
+    "SESSION_RESPONSE_ADAPTER",
+    "WANTED_CAPS_ADAPTER",
+    "dump_request",
+    "dump_request_json",
+    "dump_response_json",
+    "warm_session_models",
 ]
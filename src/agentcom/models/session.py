@@ -1,132 +1,278 @@
 """
 Pydantic models for agent session negotiation and management.
 """
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from functools import cached_property, lru_cache, partial
+from typing import Annotated, List, Dict, Any, Optional, FrozenSet, Tuple
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    TypeAdapter,
+    field_validator,
+)
+
+
+# Identifiers (session ids, agent ids, capability names): strict strings with
+# bounded length, validated by a single pydantic-core string validator.
+Identifier = Annotated[str, StringConstraints(min_length=1, max_length=256, strict=True)]
+# Free-form session intent
+Intent = Annotated[str, StringConstraints(min_length=1, max_length=1024, strict=True)]
+
+
+# Shared configuration of the session models (DTOs built once and then only
+# read or serialized). Spelled out even where it matches pydantic's defaults
+# (validate_default, validate_assignment, extra="ignore") so that no model
+# turns on an extra validation pass by accident. Models needing something
+# else override single keys, e.g. `DTO_CONFIG | ConfigDict(extra="forbid")`.
+DTO_CONFIG = ConfigDict(
+    validate_default=False,
+    validate_assignment=False,
+    extra="ignore",
+    str_strip_whitespace=False,
+    populate_by_name=True,
+    frozen=True,
+    defer_build=True,
+)
+
+
+# One bit per known transport, so sets of transports can be intersected with
+# a single `&` (unknown transports map to 0)
+TRANSPORT_BITS: Dict[str, int] = {
+    "http-json": 1 << 0,
+    "grpc": 1 << 1,
+    "nats": 1 << 2,
+    "websocket": 1 << 3,
+}
+
+
+def transport_mask(transports: Any) -> int:
+    """Return the `TRANSPORT_BITS` mask of an iterable of transport names."""
+    mask = 0
+    for transport in transports:
+        mask |= TRANSPORT_BITS.get(transport, 0)
+    return mask
+
+
+@lru_cache(maxsize=256)
+def parse_version_constraint(constraint: str) -> SpecifierSet:
+    """
+    Parse a version constraint into a `SpecifierSet`.
+
+    Besides PEP 440 specifiers (e.g. ">=1.0,<2.0"), bare versions ("1.2.0",
+    meaning "==1.2.0") and wildcards ("1.2.x", meaning "==1.2.*") are
+    accepted. Results are cached, as the same constraints recur across
+    requests.
+
+    Raises `packaging.specifiers.InvalidSpecifier` for invalid constraints.
+    """
+    parts = []
+    for part in constraint.split(","):
+        part = part.strip()
+        if part[:1].isdigit():
+            pieces = part.split(".")
+            for i, piece in enumerate(pieces):
+                if piece in ("x", "X", "*"):
+                    pieces = pieces[:i] + ["*"]
+                    break
+            part = "==" + ".".join(pieces)
+        parts.append(part)
+    return SpecifierSet(",".join(parts))
 
 
 # ===================== Request Models =====================
 
+class ConstraintSpec(BaseModel):
+    """
+    Constraints attached to a wanted capability.
+
+    Known constraints are typed; any other key is kept as an extra field.
+    """
+    model_config = DTO_CONFIG | ConfigDict(extra="allow")
+
+    max_latency_ms: Optional[int] = Field(default=None, description="Maximum acceptable P99 latency in milliseconds")
+    max_cost_usd: Optional[float] = Field(default=None, description="Maximum acceptable cost in USD")
+
+
 class WantedCapability(BaseModel):
     """Represents a capability that a client wants to use in the session."""
-    name: str = Field(..., description="Name of the capability")
+    model_config = DTO_CONFIG
+
+    name: Identifier = Field(..., description="Name of the capability")
     version: Optional[str] = Field(default=None, description="Version constraint (e.g., '>=1.0,<2.0')")
-    constraints: Optional[Dict[str, Any]] = Field(
+    constraints: Optional[ConstraintSpec] = Field(
         default=None,
         description="Additional constraints (e.g., max_latency_ms)"
     )
 
+    @field_validator("version")
+    @classmethod
+    def _check_version(cls, value: Optional[str]) -> Optional[str]:
+        if value:
+            try:
+                parse_version_constraint(value)
+            except InvalidSpecifier:
+                raise ValueError(f"Invalid version constraint: {value!r}")
+        return value
+
+    @cached_property
+    def specifier(self) -> Optional[SpecifierSet]:
+        """The parsed `version` constraint, or None if no constraint was given."""
+        return parse_version_constraint(self.version) if self.version else None
+
 
 class SessionPreferences(BaseModel):
     """Preferences for session negotiation."""
-    transport: List[str] = Field(
-        default=["http-json"],
+    model_config = DTO_CONFIG
+
+    transport: Tuple[str, ...] = Field(
+        default=("http-json",),
         description="Preferred transport protocols"
     )
     retry_strategy: str = Field(default="exponential", description="Retry strategy")
     max_retries: Optional[int] = Field(default=3, description="Maximum number of retries")
 
+    @cached_property
+    def transport_mask(self) -> int:
+        """`transport` as a `TRANSPORT_BITS` mask (preference order is lost)."""
+        return transport_mask(self.transport)
+
 
 class SessionPolicy(BaseModel):
     """Policy constraints for the session."""
+    model_config = DTO_CONFIG
+
     require_evidence: bool = Field(default=False, description="Require evidence of execution")
     conflict_resolution: str = Field(default="planner_wins", description="Conflict resolution strategy")
 
 
 class SessionMeta(BaseModel):
     """Metadata for tracing and correlation."""
+    model_config = DTO_CONFIG
+
     trace_id: Optional[str] = Field(default=None, description="Trace ID for logging")
     correlation_id: Optional[str] = Field(default=None, description="Correlation ID")
 
 
+# Frozen models can be shared safely: requests that omit these sections all
+# point to the same default instance instead of allocating a new one.
+_DEFAULT_PREFS = SessionPreferences.model_construct(
+    transport=("http-json",),
+    retry_strategy="exponential",
+    max_retries=3,
+)
+_DEFAULT_POLICY = SessionPolicy.model_construct()
+_DEFAULT_META = SessionMeta.model_construct()
+
+
 class SessionRequest(BaseModel):
-    """Request to establish a session between agents."""
-    session_id: str = Field(..., description="Unique session identifier")
-    from_agent: str = Field(..., alias="from", description="Agent ID initiating the session")
-    intent: str = Field(..., description="Intent or purpose of the session")
+    """
+    Request to establish a session between agents.
+
+    This is untrusted wire input: it is always fully validated at the HTTP
+    boundary.
+    """
+    # populate_by_name (from DTO_CONFIG) allows 'from' field despite it
+    # being a reserved keyword
+    model_config = DTO_CONFIG | ConfigDict(extra="forbid", strict=True)
+
+    session_id: Identifier = Field(..., description="Unique session identifier")
+    from_agent: Identifier = Field(..., alias="from", description="Agent ID initiating the session")
+    intent: Intent = Field(..., description="Intent or purpose of the session")
     participants: List[str] = Field(..., description="List of participating agent IDs")
     wanted_capabilities: List[WantedCapability] = Field(
         default_factory=list,
         description="Capabilities requested for this session"
     )
-    policy: Optional[SessionPolicy] = Field(default_factory=SessionPolicy, description="Session policy")
+    policy: Optional[SessionPolicy] = Field(default=_DEFAULT_POLICY, description="Session policy")
     session_preferences: SessionPreferences = Field(
-        default_factory=SessionPreferences,
+        default=_DEFAULT_PREFS,
         description="Preferences for session negotiation"
     )
     timeout_seconds: Optional[int] = Field(default=180, description="Session timeout in seconds")
-    meta: Optional[SessionMeta] = Field(default_factory=SessionMeta, description="Metadata")
+    meta: Optional[SessionMeta] = Field(default=_DEFAULT_META, description="Metadata")
 
-    class Config:
-        populate_by_name = True  # Allow 'from' field despite it being a reserved keyword
+    @cached_property
+    def participant_set(self) -> FrozenSet[str]:
+        """Participants as a frozenset, for constant-time membership checks."""
+        return frozenset(self.participants)
 
 
-# ===================== Response Models =====================
+# ===================== Type adapters =====================
 
-class AcceptedCapability(BaseModel):
-    """Details of a capability that was accepted for the session."""
-    name: str = Field(..., description="Capability name")
-    version: str = Field(..., description="Accepted version")
-    action_schema: Optional[str] = Field(default=None, description="URL to the action schema or embedded schema")
-    estimated_cost: Optional[Dict[str, Any]] = Field(default=None, description="Estimated cost of execution")
-    latency_p99_ms: Optional[int] = Field(default=None, description="P99 latency in milliseconds")
+@lru_cache(maxsize=64)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """
+    Return a cached `TypeAdapter` for `tp`.
 
+    Building an adapter compiles a new validator each time, so always go
+    through this function instead of calling `TypeAdapter(...)` per request.
+    """
+    return TypeAdapter(tp)
 
-class RejectedCapability(BaseModel):
-    """Details of a capability that was rejected."""
-    name: str = Field(..., description="Capability name")
-    reason: str = Field(..., description="Reason for rejection (e.g., 'unsupported_version', 'auth_required')")
-    supported_versions: Optional[List[str]] = Field(default=None, description="Supported versions if applicable")
-    details: Optional[str] = Field(default=None, description="Additional details")
 
+SESSION_REQUEST_ADAPTER = get_type_adapter(SessionRequest)
+WANTED_CAPS_ADAPTER = get_type_adapter(List[WantedCapability])
 
-class NegotiatedSession(BaseModel):
-    """Negotiated session parameters."""
-    timeout_seconds: int = Field(..., description="Agreed timeout")
-    transport: str = Field(..., description="Selected transport protocol")
-    retry_strategy: str = Field(..., description="Agreed retry strategy")
-    max_retries: int = Field(..., description="Agreed max retries")
+# Serializers with their options bound once, calling straight into
+# pydantic-core. Requests drop unset (None) fields.
+dump_request = partial(SESSION_REQUEST_ADAPTER.dump_python, by_alias=True, exclude_none=True)
+dump_request_json = partial(SESSION_REQUEST_ADAPTER.dump_json, by_alias=True, exclude_none=True)
 
 
-class PolicyAck(BaseModel):
-    """Acknowledgment of session policy."""
-    require_evidence: bool = Field(default=False)
-    conflict_resolution: str = Field(default="planner_wins")
+# ===================== Response-side names =====================
+# Defined in `agentcom.models.session_response`, imported on first access.
 
+RESPONSE_NAMES = frozenset({
+    "CostSpec",
+    "AcceptedCapability",
+    "RejectedCapability",
+    "NegotiatedSession",
+    "PolicyAck",
+    "ResponseSessionMeta",
+    "SessionResponse",
+    "SESSION_RESPONSE_ADAPTER",
+    "dump_response_json",
+    "build_accepted_capability",
+    "build_rejected_capability",
+    "build_negotiated_session",
+    "build_policy_ack",
+    "build_response_meta",
+    "build_session_response",
+})
 
-class ResponseSessionMeta(BaseModel):
-    """Response metadata."""
-    trace_id: Optional[str] = Field(default=None)
-    correlation_id: Optional[str] = Field(default=None)
-    responder_version: Optional[str] = Field(default=None)
 
+def __getattr__(name: str) -> Any:
+    if name in RESPONSE_NAMES:
+        from agentcom.models import session_response
+        return getattr(session_response, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-class SessionResponse(BaseModel):
-    """Response to a session establishment request."""
-    session_id: str = Field(..., description="Session identifier")
-    status: str = Field(..., description="Session status (e.g., 'accepted', 'rejected', 'partial')")
-    accepted_capabilities: List[AcceptedCapability] = Field(
-        default_factory=list,
-        description="Capabilities that were accepted"
-    )
-    rejected_capabilities: List[RejectedCapability] = Field(
-        default_factory=list,
-        description="Capabilities that were rejected"
-    )
-    negotiated_session: Optional[NegotiatedSession] = Field(
-        default=None,
-        description="Negotiated session parameters"
-    )
-    session_token: Optional[str] = Field(
-        default=None,
-        description="JWT or bearer token for subsequent calls"
-    )
-    policy_ack: Optional[PolicyAck] = Field(
-        default=None,
-        description="Acknowledgment of accepted policies"
-    )
-    meta: Optional[ResponseSessionMeta] = Field(
-        default_factory=ResponseSessionMeta,
-        description="Response metadata"
-    )
-    error: Optional[str] = Field(default=None, description="Error message if status is 'rejected'")
+
+# ===================== Deferred schema build =====================
+
+def warm_session_models() -> None:
+    """
+    Build the validators/serializers of all session models.
+
+    Every model uses `defer_build=True`, so importing this module does not
+    compile any pydantic-core schema. Call this from an application startup
+    hook to pay that cost before the first request instead of during it.
+    The response models are imported here if they were not yet.
+    """
+    from agentcom.models.session_response import RESPONSE_MODELS, SESSION_RESPONSE_ADAPTER
+
+    for model in (
+        ConstraintSpec,
+        WantedCapability,
+        SessionPreferences,
+        SessionPolicy,
+        SessionMeta,
+        SessionRequest,
+        *RESPONSE_MODELS,
+    ):
+        model.model_rebuild()
+    # The module-level adapters keep their own (deferred) core schema
+    for adapter in (SESSION_REQUEST_ADAPTER, WANTED_CAPS_ADAPTER, SESSION_RESPONSE_ADAPTER):
+        adapter.rebuild()
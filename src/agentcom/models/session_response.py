@@ -0,0 +1,173 @@
+"""
+Pydantic models for agent session negotiation responses.
+
+Split from `agentcom.models.session` so that request-side code (e.g. a
+client building a `SessionRequest`) does not define the response models at
+import time. They are still importable from `agentcom.models.session` and
+`agentcom.models`, where they are resolved on first access.
+"""
+from functools import partial
+from typing import List, Any, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+from agentcom.models.session import DTO_CONFIG, get_type_adapter
+
+
+# ===================== Response Models =====================
+# Response models are built by the agent itself from already validated data,
+# so the negotiation path uses the `build_*` helpers below, which skip
+# validation via `model_construct()`. Use the regular constructors or
+# `model_validate()` for anything coming from outside.
+
+class CostSpec(BaseModel):
+    """
+    Estimated cost of a capability, as declared with `@capability(cost=...)`
+    (e.g. `{"units": "tokens", "estimate": 5}`).
+    """
+    model_config = DTO_CONFIG | ConfigDict(extra="allow")
+
+    units: Optional[str] = Field(default=None, description="Cost units (e.g., 'tokens', 'usd')")
+    # `int` first, so `5` is reported as `5` (as in /capability), not `5.0`
+    estimate: Optional[Union[int, float]] = Field(
+        default=None, description="Estimated cost, in `units`"
+    )
+
+
+class AcceptedCapability(BaseModel):
+    """Details of a capability that was accepted for the session."""
+    model_config = DTO_CONFIG
+
+    name: str = Field(..., description="Capability name")
+    version: str = Field(..., description="Accepted version")
+    action_schema: Optional[str] = Field(default=None, description="URL to the action schema or embedded schema")
+    estimated_cost: Optional[CostSpec] = Field(default=None, description="Estimated cost of execution")
+    latency_p99_ms: Optional[int] = Field(default=None, description="P99 latency in milliseconds")
+
+
+class RejectedCapability(BaseModel):
+    """Details of a capability that was rejected."""
+    model_config = DTO_CONFIG
+
+    name: str = Field(..., description="Capability name")
+    reason: str = Field(..., description="Reason for rejection (e.g., 'unsupported_version', 'auth_required')")
+    supported_versions: Optional[List[str]] = Field(default=None, description="Supported versions if applicable")
+    details: Optional[str] = Field(default=None, description="Additional details")
+
+
+class NegotiatedSession(BaseModel):
+    """Negotiated session parameters."""
+    model_config = DTO_CONFIG
+
+    timeout_seconds: int = Field(..., description="Agreed timeout")
+    transport: str = Field(..., description="Selected transport protocol")
+    retry_strategy: str = Field(..., description="Agreed retry strategy")
+    max_retries: int = Field(..., description="Agreed max retries")
+
+
+class PolicyAck(BaseModel):
+    """Acknowledgment of session policy."""
+    model_config = DTO_CONFIG
+
+    require_evidence: bool = Field(default=False)
+    conflict_resolution: str = Field(default="planner_wins")
+
+
+class ResponseSessionMeta(BaseModel):
+    """Response metadata."""
+    model_config = DTO_CONFIG
+
+    trace_id: Optional[str] = Field(default=None)
+    correlation_id: Optional[str] = Field(default=None)
+    responder_version: Optional[str] = Field(default=None)
+
+
+_DEFAULT_RESPONSE_META = ResponseSessionMeta.model_construct()
+
+
+class SessionResponse(BaseModel):
+    """
+    Response to a session establishment request.
+
+    Built on the server from trusted data (see `build_session_response`);
+    clients decoding a response should use `model_validate()`.
+    """
+    model_config = DTO_CONFIG
+
+    session_id: str = Field(..., description="Session identifier")
+    status: str = Field(..., description="Session status (e.g., 'accepted', 'rejected', 'partial')")
+    accepted_capabilities: List[AcceptedCapability] = Field(
+        default_factory=list,
+        description="Capabilities that were accepted"
+    )
+    rejected_capabilities: List[RejectedCapability] = Field(
+        default_factory=list,
+        description="Capabilities that were rejected"
+    )
+    negotiated_session: Optional[NegotiatedSession] = Field(
+        default=None,
+        description="Negotiated session parameters"
+    )
+    session_token: Optional[str] = Field(
+        default=None,
+        description="JWT or bearer token for subsequent calls"
+    )
+    policy_ack: Optional[PolicyAck] = Field(
+        default=None,
+        description="Acknowledgment of accepted policies"
+    )
+    meta: Optional[ResponseSessionMeta] = Field(
+        default=_DEFAULT_RESPONSE_META,
+        description="Response metadata"
+    )
+    error: Optional[str] = Field(default=None, description="Error message if status is 'rejected'")
+
+
+# ===================== Type adapters =====================
+
+SESSION_RESPONSE_ADAPTER = get_type_adapter(SessionResponse)
+
+# Responses keep None fields, as clients rely on every key being present
+dump_response_json = partial(SESSION_RESPONSE_ADAPTER.dump_json, by_alias=True)
+
+
+# ===================== Trusted construction helpers =====================
+
+def build_accepted_capability(**kwargs: Any) -> AcceptedCapability:
+    """Build an `AcceptedCapability` from trusted data, without validation."""
+    return AcceptedCapability.model_construct(**kwargs)
+
+
+def build_rejected_capability(**kwargs: Any) -> RejectedCapability:
+    """Build a `RejectedCapability` from trusted data, without validation."""
+    return RejectedCapability.model_construct(**kwargs)
+
+
+def build_negotiated_session(**kwargs: Any) -> NegotiatedSession:
+    """Build a `NegotiatedSession` from trusted data, without validation."""
+    return NegotiatedSession.model_construct(**kwargs)
+
+
+def build_policy_ack(**kwargs: Any) -> PolicyAck:
+    """Build a `PolicyAck` from trusted data, without validation."""
+    return PolicyAck.model_construct(**kwargs)
+
+
+def build_response_meta(**kwargs: Any) -> ResponseSessionMeta:
+    """Build a `ResponseSessionMeta` from trusted data, without validation."""
+    return ResponseSessionMeta.model_construct(**kwargs)
+
+
+def build_session_response(**kwargs: Any) -> SessionResponse:
+    """Build a `SessionResponse` from trusted data, without validation."""
+    return SessionResponse.model_construct(**kwargs)
+
+
+RESPONSE_MODELS = (
+    CostSpec,
+    AcceptedCapability,
+    RejectedCapability,
+    NegotiatedSession,
+    PolicyAck,
+    ResponseSessionMeta,
+    SessionResponse,
+)
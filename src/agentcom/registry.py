@@ -1,10 +1,190 @@
 """
 Global registry for storing registered capabilities.
 
-This module maintains a centralized list of capabilities that are
+This module maintains a centralized registry of capabilities that are
 decorated with @capability decorator across the application.
 """
-from typing import List, Dict, Any
+import sys
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Mapping, Optional, Sequence, Tuple
 
-# Global structure to register endpoints as capabilities
-REGISTERED_ENDPOINTS: List[Dict[str, Any]] = []
+from packaging.version import InvalidVersion, Version
+
+if TYPE_CHECKING:
+    from agentcom.models.session_response import CostSpec
+
+
+@dataclass(slots=True)
+class CapabilityEntry:
+    """
+    A capability registered through the @capability decorator.
+
+    Besides the declared metadata, each entry precomputes at registration
+    time what is needed on the request path: the lower-cased method (OpenAPI
+    key), the path-derived name used as fallback lookup key, the parsed
+    version (None if it is not a valid PEP 440 version) and the public
+    mapping returned by the `/capability` endpoint.
+    """
+    path: str
+    method: str = "GET"
+    name: Optional[str] = None
+    description: str = ""
+    parameters: List[Dict[str, Any]] = field(default_factory=list)
+    auth_required: List[str] = field(default_factory=list)
+    cost: Dict[str, Any] = field(default_factory=dict)
+    rate_limit: Optional[str] = None
+    version: str = "1.0.0"
+    handler: Optional[Callable[..., Any]] = field(default=None, repr=False, compare=False)
+    # `cost` validated as a `CostSpec` (done by the @capability decorator)
+    cost_spec: Optional["CostSpec"] = field(default=None, repr=False, compare=False)
+    method_lower: str = field(init=False, repr=False, compare=False)
+    derived_name: Optional[str] = field(init=False, repr=False, compare=False)
+    parsed_version: Optional[Version] = field(init=False, repr=False, compare=False)
+    _public: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Path-derived name (e.g. "/items/list" -> "items_list")
+        path = self.path
+        self.derived_name = sys.intern(path.strip("/").replace("/", "_") or path) if path else None
+        # Registered names are interned: they live as long as the registry
+        # and are shared by its indexes (`BY_NAME`, `EXACT_INDEX`)
+        self.name = sys.intern(self.name) if self.name else self.derived_name
+        self.method_lower = self.method.lower()
+        try:
+            self.parsed_version = Version(self.version)
+        except InvalidVersion:
+            self.parsed_version = None
+        self._public = {
+            "name": self.name or path,
+            "path": path,
+            "method": self.method,
+            "description": self.description,
+            "parameters": self.parameters,
+            "auth_required": self.auth_required,
+            "cost": self.cost,
+            "rate_limit": self.rate_limit,
+            "version": self.version,
+        }
+
+    def to_public_dict(self) -> Dict[str, Any]:
+        """
+        Return the precomputed public mapping (without `action_schema`).
+
+        The mapping is shared: copy it before modifying.
+        """
+        return self._public
+
+
+# Global structure to register endpoints as capabilities, keyed by
+# (path, METHOD). Dicts keep insertion order, so `/capability` output is
+# stable, and re-registering the same endpoint replaces it in place.
+REGISTERED_ENDPOINTS: Dict[Tuple[str, str], CapabilityEntry] = {}
+
+# Immutable snapshots of the registry used on the request path. They are
+# rebuilt by `freeze_registry()` (at startup, or lazily after a change), so
+# read them through the module or `lookup()` rather than importing them.
+REGISTERED_ENDPOINTS_FROZEN: Tuple[CapabilityEntry, ...] = ()
+# Capability name (and path-derived name) -> every registered version of it,
+# in registration order
+BY_NAME: Mapping[str, Tuple[CapabilityEntry, ...]] = MappingProxyType({})
+# (name, version) -> first registered entry with exactly that version string
+EXACT_INDEX: Mapping[Tuple[str, str], CapabilityEntry] = MappingProxyType({})
+_frozen_version = -1
+
+# Bumped on every registry mutation so readers can cache derived data
+_registry_version = 0
+
+
+def get_registry_version() -> int:
+    """Return the current registry version."""
+    return _registry_version
+
+
+def bump_registry_version() -> None:
+    """Mark the registry as changed, invalidating caches built from it."""
+    global _registry_version
+    _registry_version += 1
+
+
+def get_registered_endpoints() -> List[CapabilityEntry]:
+    """Return the registered capabilities as a list, in registration order."""
+    return list(REGISTERED_ENDPOINTS.values())
+
+
+def register_endpoint(entry: CapabilityEntry) -> None:
+    """
+    Add or replace a capability entry in the registry.
+
+    Entries are keyed by `(path, METHOD)`, so registering the same endpoint
+    twice (e.g. under reloaders or in tests) does not create duplicates.
+    The new entry is always stored, so the registry points at the latest
+    handler, but the registry version is only bumped when the entry's
+    metadata actually changes (`handler` is not compared).
+    """
+    global _frozen_version
+    key = (entry.path, entry.method.upper())
+    unchanged = REGISTERED_ENDPOINTS.get(key) == entry
+    REGISTERED_ENDPOINTS[key] = entry
+    if unchanged:
+        # Caches derived from the metadata stay valid, but the snapshots must
+        # pick up the new entry
+        _frozen_version = -1
+    else:
+        bump_registry_version()
+
+
+def freeze_registry() -> None:
+    """
+    Build the immutable registry snapshots (`REGISTERED_ENDPOINTS_FROZEN`,
+    `BY_NAME` and `EXACT_INDEX`).
+
+    Registering only marks the registry as changed; the snapshots are built
+    once here, typically from an application startup hook. If capabilities
+    are registered later, the next `lookup()` refreezes automatically.
+    """
+    global REGISTERED_ENDPOINTS_FROZEN, BY_NAME, EXACT_INDEX, _frozen_version
+    if _frozen_version == _registry_version:
+        return
+
+    by_name: Dict[str, List[CapabilityEntry]] = {}
+    exact: Dict[Tuple[str, str], CapabilityEntry] = {}
+    for entry in REGISTERED_ENDPOINTS.values():
+        keys = {entry.name, entry.derived_name}
+        keys.discard(None)
+        for key in keys:
+            by_name.setdefault(key, []).append(entry)
+            exact.setdefault((key, entry.version), entry)
+
+    REGISTERED_ENDPOINTS_FROZEN = tuple(REGISTERED_ENDPOINTS.values())
+    BY_NAME = MappingProxyType({key: tuple(entries) for key, entries in by_name.items()})
+    EXACT_INDEX = MappingProxyType(exact)
+    _frozen_version = _registry_version
+
+
+def get_frozen_endpoints() -> Tuple[CapabilityEntry, ...]:
+    """Return the registered capabilities as an immutable snapshot."""
+    if _frozen_version != _registry_version:
+        freeze_registry()
+    return REGISTERED_ENDPOINTS_FROZEN
+
+
+def lookup(name: str) -> Sequence[CapabilityEntry]:
+    """
+    Return all registered versions of the capability `name`.
+
+    `name` may also be the path-derived name (e.g. "items_list").
+    """
+    if _frozen_version != _registry_version:
+        freeze_registry()
+    return BY_NAME.get(name, ())
+
+
+def lookup_exact(name: str, version: str) -> Optional[CapabilityEntry]:
+    """
+    Return the capability `name` registered with exactly the `version`
+    string, or None.
+    """
+    if _frozen_version != _registry_version:
+        freeze_registry()
+    return EXACT_INDEX.get((name, version))
@@ -0,0 +1,38 @@
+"""
+JSON serialization helpers.
+
+Uses orjson when it is installed (`pip install agentcom[orjson]`) and falls
+back to the standard library `json` module otherwise.
+"""
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize `obj` to compact UTF-8 JSON bytes.
+
+    `default` is called for objects that are not natively serializable and
+    must return a serializable value (or raise `TypeError`).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=default,
+    ).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)